@@ -24,6 +24,20 @@ Example:
     >>> print(template)
 """
 
-from . import cfn_processing
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import cfn_processing
 
 __all__ = ["cfn_processing"]
+
+# Submodules reachable as package attributes, imported on first access
+_SUBMODULES = frozenset({"cfn_processing", "cfn_tags", "cli", "openapi"})
+
+
+def __getattr__(name: str) -> Any:
+    # Import submodules on first access so the CLI does not pay for them at startup
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
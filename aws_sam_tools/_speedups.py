@@ -0,0 +1,41 @@
+"""Optional fast implementations shared by the template and OpenAPI modules.
+
+PyYAML's libyaml bindings and orjson (installed with aws-sam-tools[speedups])
+are used when they are available. Every helper here falls back to the
+pure-Python implementation otherwise.
+"""
+
+import json
+import re
+from typing import Any, Union
+
+__all__ = ["SafeDumper", "SafeLoader", "load_json"]
+
+# Prefer the libyaml-backed C implementations when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# 19+ digit runs may hold integers outside the 64-bit range, which orjson reads as floats
+_LONG_DIGITS_RE = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES_RE = re.compile(rb"\d{19,}")
+
+
+def load_json(content: Union[str, bytes]) -> Any:
+    """Parse a JSON document from a string or UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        long_digits = _LONG_DIGITS_BYTES_RE if isinstance(content, bytes) else _LONG_DIGITS_RE
+        if not long_digits.search(content):  # type: ignore[arg-type]
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Documents orjson rejects (e.g. NaN literals) go through the json module
+                pass
+    return json.loads(content)
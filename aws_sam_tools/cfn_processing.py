@@ -23,19 +23,23 @@ Example:
 """
 
 import base64
+import copy
+import functools
 import hashlib
+import io
 import json
-import mimetypes
 import os
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, Optional, Tuple, overload
 
 import yaml
 from dunamai import Style
 
-from .cfn_tags import CloudFormationLoader, CloudFormationObject
+from ._speedups import SafeDumper as _SafeDumper
+from ._speedups import load_json
+from .cfn_tags import CloudFormationLoader, CloudFormationObject, JSONFromYAMLEncoder
 
 try:
     from dunamai import Version, get_version
@@ -45,11 +49,54 @@ except ImportError:
     get_version = None
 
 
+class _StringDumper(_SafeDumper):  # type: ignore[misc]
+    """Safe YAML dumper that writes CloudFormation tags as intrinsic function mappings."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        # Values reached through YAML aliases are shared objects; write each occurrence out in full
+        return True
+
+
+def _represent_intrinsic(dumper: yaml.representer.SafeRepresenter, tag: CloudFormationObject) -> yaml.Node:
+    return dumper.represent_dict(tag.to_json())
+
+
+# Register the known tag classes by exact type, which PyYAML checks before walking the MRO
+# against multi-representers; the multi-representer still covers any other subclasses
+for _tag_class in CloudFormationObject.__subclasses__():
+    _StringDumper.add_representer(_tag_class, _represent_intrinsic)
+_StringDumper.add_multi_representer(CloudFormationObject, _represent_intrinsic)
+
+# Serializers used by !CFNToolsToString, built once instead of per tag occurrence.
+# They convert CloudFormation tags while serializing, at any depth, so no separate pre-pass is needed.
+_dump_yaml_string = functools.partial(yaml.dump, Dumper=_StringDumper, default_flow_style=False, sort_keys=False)
+_dump_json_one_line = JSONFromYAMLEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_dump_json_pretty = JSONFromYAMLEncoder(indent=2, ensure_ascii=False).encode
+
+# Parsed !CFNToolsIncludeFile results keyed by (path, loader class), stored with the file's
+# (mtime, size) when it was read and the function that copies them for each caller
+_include_cache: Dict[tuple, Tuple[Tuple[int, int], Any, Callable[[Any], Any]]] = {}
+
+
 def get_node_type_name(node: yaml.Node) -> str:
     """Get the name of the node type."""
     return node.__class__.__name__
 
 
+def _copy_json_tree(value: Any) -> Any:
+    """Copy parsed JSON data; its dicts and lists form a tree of immutable leaves, so no memo is needed."""
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _copy_json_tree(item) for key, item in value.items()}
+    if value_type is list:
+        return [_copy_json_tree(item) for item in value]
+    return value
+
+
+def _same_value(value: Any) -> Any:
+    return value
+
+
 def construct_cfntools_include_file(loader: yaml.Loader, node: yaml.Node) -> Any:
     """Construct !CFNToolsIncludeFile tag."""
     if not isinstance(node, yaml.ScalarNode):
@@ -78,8 +125,10 @@ def construct_cfntools_include_file(loader: yaml.Loader, node: yaml.Node) -> Any
             # Use current working directory if no loader name
             file_path = os.path.abspath(file_path)
 
-    # Check if file exists
-    if not os.path.exists(file_path):
+    # Check if file exists; the same stat result validates the include cache
+    try:
+        stat = os.stat(file_path)
+    except OSError:
         raise yaml.constructor.ConstructorError(
             None,
             None,
@@ -87,23 +136,47 @@ def construct_cfntools_include_file(loader: yaml.Loader, node: yaml.Node) -> Any
             node.start_mark,
         )
 
-    # Determine file type and load accordingly
-    mime_type, _ = mimetypes.guess_type(file_path)
-    file_extension = Path(file_path).suffix.lower()
+    # Reuse the result of an earlier include of the same, unchanged file; a changed file replaces its entry
+    cache_key = (os.path.abspath(file_path), loader.__class__)
+    file_version = (stat.st_mtime_ns, stat.st_size)
+    cached_entry = _include_cache.get(cache_key)
+    if cached_entry is not None and cached_entry[0] == file_version:
+        _, cached, copy_result = cached_entry
+        return copy_result(cached)
 
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+    # Determine file type from the extension, consulting mimetypes only for unknown extensions
+    file_extension = os.path.splitext(file_path)[1].lower()
+    is_json = file_extension == ".json"
+    if not is_json and file_extension not in (".yaml", ".yml"):
+        # mimetypes reads the system type database on first use, so only import it when needed
+        import mimetypes
 
-        # Handle structured data formats
-        if file_extension in [".yaml", ".yml"]:
+        mime_type, _ = mimetypes.guess_type(file_path)
+        is_json = bool(mime_type and "json" in mime_type)
+
+    try:
+        if is_json:
+            # JSON parsers accept UTF-8 bytes directly, so skip decoding the file into a str first
+            with open(file_path, "rb") as f:
+                result = load_json(f.read())
+            copy_result = _copy_json_tree
+        elif file_extension in (".yaml", ".yml"):
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
             # Use the same loader to support nested CloudFormation tags
-            return yaml.load(content, Loader=loader.__class__)
-        elif file_extension == ".json" or (mime_type and "json" in mime_type):
-            return json.loads(content)
+            result = yaml.load(content, Loader=loader.__class__)
+            # CFNTools tags (UUIDs, timestamps, nested includes) must be evaluated on every include
+            if "!CFNTools" in content:
+                _include_cache.pop(cache_key, None)
+                return result
+            # YAML may hold tags, anchors shared between nodes or other types, so it gets a full deep copy
+            copy_result = copy.deepcopy
         else:
             # Return as plain string for other file types
-            return content
+            with open(file_path, "r", encoding="utf-8") as f:
+                result = f.read()
+            # Strings are immutable and can be handed out as-is
+            copy_result = _same_value
     except Exception as e:
         raise yaml.constructor.ConstructorError(
             None,
@@ -112,6 +185,9 @@ def construct_cfntools_include_file(loader: yaml.Loader, node: yaml.Node) -> Any
             node.start_mark,
         )
 
+    _include_cache[cache_key] = (file_version, result, copy_result)
+    return copy_result(result)
+
 
 def cloudformation_tag_to_dict(tag: CloudFormationObject) -> Dict[str, Any]:
     """Convert CloudFormation tag to a dictionary representation."""
@@ -121,7 +197,11 @@ def cloudformation_tag_to_dict(tag: CloudFormationObject) -> Dict[str, Any]:
 
 
 def prepare_value_for_serialization(value: Any) -> Any:
-    """Recursively prepare a value for JSON/YAML serialization by converting CloudFormation tags."""
+    """Recursively prepare a value for JSON/YAML serialization by converting CloudFormation tags.
+
+    Public helper for callers that serialize loaded templates with their own
+    encoder; !CFNToolsToString converts tags inside its serializers instead.
+    """
     if isinstance(value, CloudFormationObject):
         return cloudformation_tag_to_dict(value)
     elif isinstance(value, dict):
@@ -192,16 +272,11 @@ def construct_cfntools_to_string(loader: yaml.Loader, node: yaml.Node) -> str:
     if isinstance(value, str):
         result = value
     elif isinstance(value, (dict, list)):
-        # Prepare value by converting CloudFormation tags
-        prepared_value = prepare_value_for_serialization(value)
-
+        # CloudFormation tags are converted to intrinsic functions by the serializers themselves
         if convert_to == "YAMLString":
-            result = yaml.dump(prepared_value, default_flow_style=False, sort_keys=False).rstrip("\n")
+            result = _dump_yaml_string(value).rstrip("\n")
         else:  # JSONString
-            if one_line:
-                result = json.dumps(prepared_value, separators=(",", ":"), ensure_ascii=False)
-            else:
-                result = json.dumps(prepared_value, indent=2, ensure_ascii=False)
+            result = _dump_json_one_line(value) if one_line else _dump_json_pretty(value)
     else:
         # For other types, convert directly to string
         result = str(value)
@@ -553,9 +628,17 @@ def load_yaml(stream: str, file_name: Optional[str] = None, replace_tags: bool =
     Returns:
         Dict containing the parsed YAML with all tags processed
     """
+    return _load_stream(stream, file_name, replace_tags)
+
+
+def _load_stream(stream: Any, file_name: Optional[str], replace_tags: bool) -> Dict[str, Any]:
+    if file_name and isinstance(stream, str):
+        # The libyaml parser takes the name for error marks from the stream when it is created
+        stream = io.StringIO(stream)
+        stream.name = file_name
     loader = CloudFormationProcessingLoader(stream)
     if file_name:
-        loader.name = file_name
+        loader.name = file_name  # type: ignore[attr-defined]
     try:
         data = loader.get_single_data()
         if replace_tags:
@@ -576,12 +659,24 @@ def load_yaml_file(file_path: str, replace_tags: bool = False) -> Dict[str, Any]
     Returns:
         Dict containing the parsed YAML with all tags processed
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    return load_yaml(content, file_path, replace_tags)
+    # The parser reads and decodes the file in chunks itself, and names it in error marks
+    with open(file_path, "rb") as f:
+        return _load_stream(f, file_path, replace_tags)
 
 
-def process_yaml_template(template_path: str, replace_tags: bool = False, **dump_kwargs) -> str:
+@overload
+def process_yaml_template(template_path: str, replace_tags: bool = False, stream: None = None, **dump_kwargs: Any) -> str: ...
+
+
+@overload
+def process_yaml_template(template_path: str, replace_tags: bool, stream: IO[str], **dump_kwargs: Any) -> None: ...
+
+
+@overload
+def process_yaml_template(template_path: str, replace_tags: bool = False, *, stream: IO[str], **dump_kwargs: Any) -> None: ...
+
+
+def process_yaml_template(template_path: str, replace_tags: bool = False, stream: Optional[IO[str]] = None, **dump_kwargs: Any) -> Optional[str]:
     """
     Process a CloudFormation YAML template file and return the processed YAML string.
 
@@ -592,10 +687,11 @@ def process_yaml_template(template_path: str, replace_tags: bool = False, **dump
     Args:
         template_path: Path to the CloudFormation template file
         replace_tags: If True, replace CloudFormation tags with intrinsic functions
+        stream: Optional file-like object to write the YAML to instead of building a string
         **dump_kwargs: Additional keyword arguments to pass to dump_yaml
 
     Returns:
-        Processed YAML template as a string
+        Processed YAML template as a string if stream is None, otherwise None
 
     Raises:
         FileNotFoundError: If the template file doesn't exist
@@ -625,8 +721,5 @@ def process_yaml_template(template_path: str, replace_tags: bool = False, **dump
     }
     default_dump_kwargs.update(dump_kwargs)
 
-    # Convert to YAML string using CloudFormation dumper
-    result = dump_yaml(processed_data, **default_dump_kwargs)
-    # When stream=None, dump_yaml always returns a string, never None
-    assert result is not None
-    return result
+    # Convert to YAML using CloudFormation dumper, writing straight to the stream if given
+    return dump_yaml(processed_data, stream=stream, **default_dump_kwargs)
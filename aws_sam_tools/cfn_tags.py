@@ -22,11 +22,19 @@ __version__ = "1.1.0"
 import itertools
 import json
 import re
+import string
 from typing import Any, Dict, Optional
 
-import six
 import yaml
-from yaml.constructor import ConstructorError
+from yaml.constructor import BaseConstructor, ConstructorError
+from yaml.representer import BaseRepresenter
+
+from ._speedups import SafeDumper as _BaseDumper
+from ._speedups import SafeLoader as _BaseLoader
+
+# Scalars matching this pattern (simple identifiers and AWS pseudo parameters) are dumped in plain style
+_IDENT_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_\-]*(::[a-zA-Z][a-zA-Z0-9]*)*\Z")
+_IDENT_CHARS = frozenset(string.ascii_letters + string.digits + "_-:")
 
 
 class CloudFormationObject(object):
@@ -40,25 +48,28 @@ class CloudFormationObject(object):
     tag = None
     type = None
 
+    # Templates can hold many tag instances; slots keep each one to a single reference
+    __slots__ = ("data",)
+
     def __init__(self, data):
         self.data = data
 
     def to_json(self):
         """Return the JSON equivalent"""
-
-        def convert(obj):
-            return obj.to_json() if isinstance(obj, CloudFormationObject) else obj
-
-        if isinstance(self.data, dict):
-            data = {key: convert(value) for key, value in six.iteritems(self.data)}
-        elif isinstance(self.data, (list, tuple)):
-            data = [convert(value) for value in self.data]
-        else:
-            data = self.data
+        # Containers are only rebuilt when they hold nested tags; otherwise the data is returned as-is
+        data = self.data
+        if isinstance(data, dict):
+            if any(isinstance(value, CloudFormationObject) for value in data.values()):
+                data = {key: _to_json_value(value) for key, value in data.items()}
+        elif isinstance(data, list):
+            if any(isinstance(value, CloudFormationObject) for value in data):
+                data = [_to_json_value(value) for value in data]
+        elif isinstance(data, tuple):
+            data = [_to_json_value(value) for value in data]
 
         name = self.name
 
-        if name == "Fn::GetAtt" and isinstance(data, six.string_types):
+        if name == "Fn::GetAtt" and isinstance(data, str):
             data = data.split(".")  # type: ignore[union-attr]
         elif name == "Ref" and "." in data:
             name = "Fn::GetAtt"
@@ -68,25 +79,47 @@ class CloudFormationObject(object):
 
     @classmethod
     def construct(cls, loader, node):
+        return cls.constructor()(loader, node)
+
+    @classmethod
+    def constructor(cls):
+        """Return a YAML constructor function specialized for this class's node type"""
         if cls.type == cls.SCALAR:
-            return cls(loader.construct_scalar(node))
+
+            def construct_node(loader, node):
+                return cls(loader.construct_scalar(node))
+
         elif cls.type == cls.SEQUENCE:
-            return cls(loader.construct_sequence(node))
-        elif cls.type == cls.SEQUENCE_OR_SCALAR:
-            try:
+
+            def construct_node(loader, node):
                 return cls(loader.construct_sequence(node))
-            except ConstructorError:
-                return cls(loader.construct_scalar(node))
+
+        elif cls.type == cls.SEQUENCE_OR_SCALAR:
+
+            def construct_node(loader, node):
+                try:
+                    return cls(loader.construct_sequence(node))
+                except ConstructorError:
+                    return cls(loader.construct_scalar(node))
+
         elif cls.type == cls.MAPPING:
-            return cls(loader.construct_mapping(node))
-        elif cls.type == cls.MAPPING_OR_SCALAR:
-            try:
+
+            def construct_node(loader, node):
                 return cls(loader.construct_mapping(node))
-            except ConstructorError:
-                return cls(loader.construct_scalar(node))
+
+        elif cls.type == cls.MAPPING_OR_SCALAR:
+
+            def construct_node(loader, node):
+                try:
+                    return cls(loader.construct_mapping(node))
+                except ConstructorError:
+                    return cls(loader.construct_scalar(node))
+
         else:
             raise RuntimeError("Unknown type {}".format(cls.type))
 
+        return construct_node
+
     @classmethod
     def represent(cls, dumper, obj):
         data = obj.data
@@ -96,7 +129,7 @@ class CloudFormationObject(object):
             return dumper.represent_mapping(obj.tag, data)
         else:
             # For CloudFormation tags, use plain style for simple identifiers and common AWS pseudo parameters
-            if isinstance(data, str) and re.match(r"^[a-zA-Z][a-zA-Z0-9_\-]*(::[a-zA-Z][a-zA-Z0-9]*)*$", data):
+            if isinstance(data, str) and _IDENT_CHARS.issuperset(data) and _IDENT_RE.match(data):
                 return dumper.represent_scalar(obj.tag, data, style="")
             else:
                 return dumper.represent_scalar(obj.tag, data)
@@ -108,7 +141,11 @@ class CloudFormationObject(object):
         return "{}({})".format(self.__class__.__name__, repr(self.data))
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and other.data == self.data
+        return other.__class__ is self.__class__ and other.data == self.data
+
+
+def _to_json_value(obj):
+    return obj.to_json() if isinstance(obj, CloudFormationObject) else obj
 
 
 class JSONFromYAMLEncoder(json.JSONEncoder):
@@ -145,47 +182,58 @@ functions = [
 _object_classes = None
 
 
-def inject(*args):
-    global _object_classes
-    _object_classes = []
-
-    loaders = [arg for arg in args if issubclass(arg, yaml.SafeLoader)]
-    dumpers = [arg for arg in args if issubclass(arg, yaml.SafeDumper)]
-
+def _create_object_classes():
+    object_classes = []
     for name_, tag_, type_ in itertools.chain(functions, [ref, condition]):
-        if not tag_.startswith("!"):
-            tag_ = "!{}".format(tag_)
-        tag_ = six.u(tag_)
+        # The spec holds the bare tag name, which doubles as the class name
+        obj_cls_name = tag_.lstrip("!")
+        tag_ = "!{}".format(obj_cls_name)
 
         class Object(CloudFormationObject):
+            __slots__ = ()
             name = name_
             tag = tag_
             type = type_
 
-        obj_cls_name = re.search(r"\w+$", tag_).group(0)  # type: ignore[union-attr]
-        if six.PY2:
-            obj_cls_name = str(obj_cls_name)
-        Object.__name__ = obj_cls_name
+        Object.__name__ = Object.__qualname__ = obj_cls_name
 
-        _object_classes.append(Object)
+        object_classes.append(Object)
         globals()[obj_cls_name] = Object
+    return object_classes
+
+
+def inject(*args):
+    """Register the CloudFormation tag classes on the given loader and dumper classes.
 
+    The tag classes are created on the first call only, so repeated calls keep
+    class identity stable and just register them on any additional loaders/dumpers.
+    """
+    global _object_classes
+    if _object_classes is None:
+        _object_classes = _create_object_classes()
+
+    loaders = [arg for arg in args if issubclass(arg, BaseConstructor)]
+    dumpers = [arg for arg in args if issubclass(arg, BaseRepresenter)]
+
+    for Object in _object_classes:
         # Register constructors for all loaders
-        for loader in loaders:
-            loader.add_constructor(tag_, Object.construct)
+        if loaders:
+            constructor = Object.constructor()
+            for loader in loaders:
+                loader.add_constructor(Object.tag, constructor)
 
         # Register representers for all dumpers
         for dumper in dumpers:
             dumper.add_representer(Object, Object.represent)
 
 
-class CloudFormationLoader(yaml.SafeLoader):
+class CloudFormationLoader(_BaseLoader):  # type: ignore[misc]
     """Custom YAML loader that supports CloudFormation tags."""
 
     pass
 
 
-class CloudFormationDumper(yaml.SafeDumper):
+class CloudFormationDumper(_BaseDumper):  # type: ignore[misc]
     """Custom YAML dumper that supports CloudFormation tags."""
 
     pass
@@ -233,19 +281,11 @@ def dump_yaml(data: Dict[str, Any], stream=None, **kwargs) -> Optional[str]:
     Returns:
         YAML string if stream is None, otherwise None
     """
-    # Set defaults
-    dump_kwargs = {
-        "default_flow_style": False,
-        "sort_keys": False,
-    }
-    # Update with provided kwargs
-    dump_kwargs.update(kwargs)
-
     return yaml.dump(
         data,
         stream=stream,
         Dumper=CloudFormationDumper,
-        default_flow_style=dump_kwargs.get("default_flow_style", False),
-        sort_keys=dump_kwargs.get("sort_keys", False),
-        allow_unicode=dump_kwargs.get("allow_unicode", True),
+        default_flow_style=kwargs.get("default_flow_style", False),
+        sort_keys=kwargs.get("sort_keys", False),
+        allow_unicode=kwargs.get("allow_unicode", True),
     )
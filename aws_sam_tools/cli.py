@@ -16,14 +16,8 @@ Example usage:
 """
 
 import sys
-from pathlib import Path
 
 import click
-import yaml
-
-from aws_sam_tools.cfn_processing import process_yaml_template
-from aws_sam_tools.openapi import OutputFormat
-from aws_sam_tools.openapi import process_openapi as process_openapi_spec
 
 
 @click.version_option(prog_name="aws-sam-tools")
@@ -43,14 +37,14 @@ def template() -> None:
 @click.option(
     "--template",
     "-t",
-    type=click.Path(path_type=Path),
+    type=click.Path(),
     default="template.yaml",
     help="Path to the CloudFormation YAML file (default: template.yaml)",
 )
 @click.option(
     "--output",
     "-o",
-    type=click.Path(path_type=Path),
+    type=click.Path(),
     default="-",
     help="Output file path. Use '-' for stdout (default: -)",
 )
@@ -60,24 +54,29 @@ def template() -> None:
     default=False,
     help="Replace CloudFormation tags with intrinsic functions",
 )
-def process(template: Path, output: Path, replace_tags: bool) -> None:
+def process(template: str, output: str, replace_tags: bool) -> None:
     """Process all CFNTools tags in the CloudFormation YAML file."""
+    # Deferred so that --help and other commands do not load PyYAML and the processing tags
+    import yaml
+
+    from aws_sam_tools.cfn_processing import process_yaml_template
+
     try:
-        # Process the template using the core function
-        output_yaml = process_yaml_template(str(template), replace_tags=replace_tags)
+        # Process the template, streaming the YAML to stdout or to the output file.
+        # The file is opened lazily so a template that fails to load leaves any existing output untouched.
+        with click.open_file(output, "w", encoding="utf-8", lazy=True) as stream:
+            process_yaml_template(template, replace_tags=replace_tags, stream=stream)
 
-        # Write output
-        if str(output) == "-":
-            # Write to stdout
-            click.echo(output_yaml, nl=False)
-        else:
-            # Write to file
-            output.write_text(output_yaml, encoding="utf-8")
+        if output != "-":
             click.echo(f"Processed template written to: {output}", err=True)
 
     except FileNotFoundError as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    except click.FileError as e:
+        # Raised when the lazily opened output file cannot be created; its message alone omits the path
+        click.echo(f"Error: {e.message}: {e.ui_filename!r}", err=True)
+        sys.exit(1)
     except yaml.YAMLError as e:
         click.echo(f"Error: Failed to parse YAML: {e}", err=True)
         sys.exit(1)
@@ -122,6 +121,12 @@ def openapi() -> None:
 )
 def process_openapi(rule: tuple, input: str, output: str, format: str) -> None:
     """Process OpenAPI specification with rules."""
+    # Deferred so that --help and other commands do not load PyYAML and the rule engine
+    from pathlib import Path
+
+    from aws_sam_tools.openapi import OutputFormat
+    from aws_sam_tools.openapi import process_openapi as process_openapi_spec
+
     try:
         # Read input
         if input == "-":
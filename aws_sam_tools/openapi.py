@@ -25,14 +25,27 @@ Example:
     >>> # Operations without security are removed
 """
 
-import copy
+import ast
+import functools
 import json
+import os
+import re
 from enum import Enum
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 import yaml
 
+from ._speedups import SafeDumper as _SafeDumper
+from ._speedups import SafeLoader as _SafeLoader
+from ._speedups import load_json
+
+# Leading characters of a JSON object or array document
+_JSON_START_RE = re.compile(r"\s*[\[{]")
+
+
+# Path item keys that hold operations
+_HTTP_METHODS = frozenset({"get", "post", "put", "delete", "patch", "head", "options", "trace"})
+
 
 class OutputFormat(Enum):
     """Supported output formats for OpenAPI specifications.
@@ -79,6 +92,8 @@ class SafeNavigationDict:
         SafeNavigationDict(None)
     """
 
+    __slots__ = ("_data",)
+
     def __init__(self, data: Any):
         self._data = data
 
@@ -93,7 +108,7 @@ class SafeNavigationDict:
                     return SafeNavigationDict(self._data[idx])
             except (ValueError, TypeError):
                 pass
-        return SafeNavigationDict(None)
+        return _MISSING
 
     def __getitem__(self, key: Union[str, int]) -> "SafeNavigationDict":
         """Safe index access."""
@@ -106,22 +121,23 @@ class SafeNavigationDict:
                     return SafeNavigationDict(self._data[idx])
             except (ValueError, TypeError):
                 pass
-        return SafeNavigationDict(None)
+        return _MISSING
 
     def __eq__(self, other: Any) -> bool:
         """Equality comparison for OpenAPI security."""
+        data = self._data
         if isinstance(other, SafeNavigationDict):
-            return self._data == other._data
+            return data == other._data
 
         # Special handling for security comparisons
-        if isinstance(other, str) and isinstance(self._data, list):
+        if isinstance(other, str) and isinstance(data, list):
             # Check if any security requirement matches the string
-            for item in self._data:
+            for item in data:
                 if isinstance(item, dict) and other in item:
                     return True
             return False
 
-        return self._data == other
+        return data == other
 
     def __ne__(self, other: Any) -> bool:
         """Inequality comparison."""
@@ -150,6 +166,36 @@ class SafeNavigationDict:
         return self._data
 
 
+# Shared result of every missing key or index lookup
+_MISSING = SafeNavigationDict(None)
+
+# Attributes served by SafeNavigationDict itself (e.g. .value) rather than by the wrapped data
+_NAV_RESERVED = frozenset(dir(SafeNavigationDict))
+
+
+def _navigate(nav: SafeNavigationDict, keys: tuple) -> SafeNavigationDict:
+    """Follow a chain of keys/indices from a wrapper, wrapping only the final value.
+
+    Equivalent to applying SafeNavigationDict item access once per key, without
+    allocating a wrapper for every intermediate hop.
+    """
+    data = nav._data
+    for key in keys:
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+            continue
+        if isinstance(data, list):
+            try:
+                idx = int(key) if isinstance(key, str) else key
+                if 0 <= idx < len(data):
+                    data = data[idx]
+                    continue
+            except (ValueError, TypeError):
+                pass
+        return _MISSING
+    return SafeNavigationDict(data)
+
+
 class RuleContext:
     """Context for safe rule evaluation.
 
@@ -163,6 +209,8 @@ class RuleContext:
         method: The HTTP method being evaluated
     """
 
+    __slots__ = ("resource", "path", "method", "_values")
+
     def __init__(self, resource: Any, path: Optional[str] = None, method: Optional[str] = None):
         """Initialize rule context.
 
@@ -174,10 +222,168 @@ class RuleContext:
         self.resource = SafeNavigationDict(resource)
         self.path = path
         self.method = method
+        self._values = {"resource": self.resource, "path": path, "method": method}
 
     def __getitem__(self, key: str) -> Any:
         """Allow context['key'] access."""
-        return getattr(self, key, None)
+        return self._values.get(key)
+
+
+# Restricted builtins available to rule filter expressions
+_SAFE_BUILTINS: Dict[str, Any] = {
+    "None": None,
+    "True": True,
+    "False": False,
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "list": list,
+    "dict": dict,
+    "any": any,
+    "all": all,
+}
+
+# Globals shared by every rule evaluation; only the locals differ per operation
+_SAFE_GLOBALS: Dict[str, Any] = {"__builtins__": _SAFE_BUILTINS, "_navigate": _navigate}
+
+
+_NodeT = TypeVar("_NodeT", bound=ast.AST)
+
+
+class _ExpressionRewriter:
+    """Base class for AST rewrites applied bottom-up without recursion.
+
+    ast.NodeTransformer recurses once per nesting level, so long expressions such
+    as a sum of a thousand terms would exhaust the interpreter stack. Nodes are
+    instead collected with an explicit stack and rewritten children first.
+    """
+
+    def visit(self, tree: _NodeT) -> _NodeT:
+        # Depth-first order puts every node after its parent; reversed, children are rewritten first
+        slots: List[tuple] = []
+        stack: List[tuple] = [(tree, None, None, None)]
+        while stack:
+            node, parent, field, index = stack.pop()
+            slots.append((node, parent, field, index))
+            for name, value in ast.iter_fields(node):
+                if isinstance(value, list):
+                    stack.extend((item, node, name, i) for i, item in enumerate(value) if isinstance(item, ast.AST))
+                elif isinstance(value, ast.AST):
+                    stack.append((value, node, name, None))
+
+        for node, parent, field, index in reversed(slots):
+            replacement = self.rewrite(node)
+            if replacement is node:
+                continue
+            if parent is None:
+                tree = replacement  # type: ignore[assignment]
+            elif index is None:
+                setattr(parent, field, replacement)
+            else:
+                getattr(parent, field)[index] = replacement
+        return tree
+
+    def rewrite(self, node: ast.AST) -> ast.AST:
+        """Return the replacement for node, whose children have already been rewritten."""
+        return node
+
+
+class _IsNoneRewriter(_ExpressionRewriter):
+    """Rewrite `x is None` / `x is not None` into boolean checks.
+
+    Missing values are SafeNavigationDict(None) wrappers rather than None itself,
+    so identity comparisons against None are replaced by `not bool(x)` / `bool(x)`.
+    """
+
+    def rewrite(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], (ast.Is, ast.IsNot)):
+            comparator = node.comparators[0]
+            if isinstance(comparator, ast.Constant) and comparator.value is None:
+                check = ast.Call(func=ast.Name(id="bool", ctx=ast.Load()), args=[node.left], keywords=[])
+                if isinstance(node.ops[0], ast.Is):
+                    return ast.copy_location(ast.UnaryOp(op=ast.Not(), operand=check), node)
+                return ast.copy_location(check, node)
+        return node
+
+
+class _NavigationRewriter(_ExpressionRewriter):
+    """Collapse `resource.a.b[0]` access chains into one `_navigate(resource, ("a", "b", 0))` call.
+
+    Only the final value of a chain is wrapped in a SafeNavigationDict, so
+    comparisons keep their semantics without a wrapper per hop.
+    """
+
+    def __init__(self) -> None:
+        # Calls created here, which later hops of the same chain extend
+        self._calls: set = set()
+
+    def rewrite(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, ast.Attribute) and node.attr not in _NAV_RESERVED:
+            key: ast.expr = ast.Constant(value=node.attr)
+        elif isinstance(node, ast.Subscript) and not isinstance(node.slice, ast.Slice):
+            key = node.slice
+        else:
+            return node
+
+        value = node.value
+        if isinstance(value, ast.Call) and id(value) in self._calls:
+            # The inner part of the chain was already collapsed; append this hop to its keys
+            value.args[1].elts.append(key)  # type: ignore[attr-defined]
+            return ast.copy_location(value, node)
+        if not (isinstance(value, ast.Name) and value.id == "resource"):
+            return node
+
+        call = ast.Call(
+            func=ast.Name(id="_navigate", ctx=ast.Load()),
+            args=[value, ast.Tuple(elts=[key], ctx=ast.Load())],
+            keywords=[],
+        )
+        self._calls.add(id(call))
+        return ast.copy_location(call, node)
+
+
+def _fix_missing_locations(tree: _NodeT) -> _NodeT:
+    """Iterative ast.fix_missing_locations, which recurses once per nesting level."""
+    stack: List[tuple] = [(tree, 1, 0, 1, 0)]
+    while stack:
+        node, lineno, col_offset, end_lineno, end_col_offset = stack.pop()
+        if "lineno" in node._attributes:
+            if getattr(node, "lineno", None) is None:
+                node.lineno = lineno  # type: ignore[attr-defined]
+            else:
+                lineno = node.lineno  # type: ignore[attr-defined]
+            if getattr(node, "col_offset", None) is None:
+                node.col_offset = col_offset  # type: ignore[attr-defined]
+            else:
+                col_offset = node.col_offset  # type: ignore[attr-defined]
+        if "end_lineno" in node._attributes:
+            if getattr(node, "end_lineno", None) is None:
+                node.end_lineno = end_lineno  # type: ignore[attr-defined]
+            else:
+                end_lineno = node.end_lineno  # type: ignore[attr-defined]
+            if getattr(node, "end_col_offset", None) is None:
+                node.end_col_offset = end_col_offset  # type: ignore[attr-defined]
+            else:
+                end_col_offset = node.end_col_offset  # type: ignore[attr-defined]
+        stack.extend((child, lineno, col_offset, end_lineno, end_col_offset) for child in ast.iter_child_nodes(node))
+    return tree
+
+
+def _compile_rule_function(expression: ast.expr, filename: str) -> Callable[..., Any]:
+    """Compile an expression into a function taking the context values as arguments.
+
+    Evaluating the rule is then a plain call instead of eval() with a fresh locals dict.
+    """
+    function = ast.FunctionDef(
+        name="_rule",
+        args=ast.arguments(args=[ast.arg(arg="resource"), ast.arg(arg="path"), ast.arg(arg="method")]),
+        body=[ast.Return(value=expression)],
+    )
+    namespace = dict(_SAFE_GLOBALS)
+    exec(compile(_fix_missing_locations(ast.Module(body=[function])), filename, "exec"), namespace)
+    return namespace["_rule"]
 
 
 class Rule:
@@ -210,6 +416,36 @@ class Rule:
         self.action = Action(parts[1])
         self.filter_expression = parts[2]
 
+        # Compile once so evaluating the rule against every operation skips parsing
+        filename = "<rule>"
+        try:
+            tree = ast.parse(self.filter_expression, mode="eval")
+            tree = _IsNoneRewriter().visit(_NavigationRewriter().visit(tree))
+            # Compiling the bare expression also rejects constructs only valid in a function body, such as yield
+            compile(_fix_missing_locations(tree), filename, "eval")
+            self._function = _compile_rule_function(tree.body, filename)
+        except (SyntaxError, ValueError, RecursionError):
+            # Invalid expressions never match, as before. That includes ones with null characters and ones
+            # nested too deeply for the parser or compiler, which eval() failed on as well.
+            tree = ast.Expression(body=ast.Constant(value=False))
+            self._function = _compile_rule_function(tree.body, filename)
+
+        # Expressions that only use literals and builtins give the same result for every operation
+        self._constant: Optional[bool] = None
+        names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        if names <= _SAFE_BUILTINS.keys():
+            self._constant = self._call(None, None, None)
+
+        # Rules that never look at the resource can be evaluated without a RuleContext
+        self._uses_resource = "resource" in names
+
+    def _call(self, resource: Any, path: Optional[str], method: Optional[str]) -> bool:
+        """Run the compiled rule function; expressions that raise never match."""
+        try:
+            return bool(self._function(resource, path, method))
+        except Exception:
+            return False
+
     def evaluate(self, context: RuleContext) -> bool:
         """Evaluate the filter expression in the given context.
 
@@ -219,45 +455,21 @@ class Rule:
         Returns:
             True if the rule matches, False otherwise
         """
-        # Create a safe evaluation environment
-        safe_globals = {
-            "__builtins__": {
-                "None": None,
-                "True": True,
-                "False": False,
-                "len": len,
-                "str": str,
-                "int": int,
-                "float": float,
-                "bool": bool,
-                "list": list,
-                "dict": dict,
-                "any": any,
-                "all": all,
-            }
-        }
-
-        # Add context variables
-        safe_locals = {
-            "resource": context.resource,
-            "path": context.path,
-            "method": context.method,
-        }
-
-        # Override is/is not comparisons for SafeNavigationDict
-        def custom_eval(expr, globals, locals):
-            # Replace 'is not None' with boolean check
-            if "is not None" in expr:
-                expr = expr.replace("is not None", ".__bool__()")
-            if "is None" in expr:
-                expr = expr.replace("is None", ".__bool__() == False")
-            return eval(expr, globals, locals)
+        if self._constant is not None:
+            return self._constant
+        return self._call(context.resource, context.path, context.method)
 
-        try:
-            result = bool(custom_eval(self.filter_expression, safe_globals, safe_locals))
-            return result
-        except Exception:
-            return False
+    def _evaluate_path_method(self, path: str, method: str) -> bool:
+        """Evaluate a rule that does not reference the resource from the path and method alone."""
+        if self._constant is not None:
+            return self._constant
+        return self._call(None, path, method)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_rule(rule_string: str) -> Rule:
+    """Parse and compile a rule string, reusing the Rule for repeated rule strings."""
+    return Rule(rule_string)
 
 
 def detect_format(file_path: Optional[str], format_hint: Optional[OutputFormat] = None) -> OutputFormat:
@@ -272,10 +484,10 @@ def detect_format(file_path: Optional[str], format_hint: Optional[OutputFormat]
     """
     # If file path is provided, check extension
     if file_path and file_path != "-":
-        path = Path(file_path)
-        if path.suffix.lower() in [".yaml", ".yml"]:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in (".yaml", ".yml"):
             return OutputFormat.YAML
-        elif path.suffix.lower() == ".json":
+        elif extension == ".json":
             return OutputFormat.JSON
 
     # Use format hint if provided
@@ -286,28 +498,50 @@ def detect_format(file_path: Optional[str], format_hint: Optional[OutputFormat]
     return OutputFormat.YAML
 
 
-def load_openapi_spec(content: str, format_hint: Optional[OutputFormat] = None) -> tuple[Dict[str, Any], OutputFormat]:
+def _load_yaml(content: str) -> Any:
+    """Parse YAML content with the safe loader."""
+    return yaml.load(content, Loader=_SafeLoader)
+
+
+def load_openapi_spec(
+    content: str,
+    format_hint: Optional[OutputFormat] = None,
+    *,
+    json_loads: Optional[Callable[[str], Any]] = None,
+    yaml_load: Optional[Callable[[str], Any]] = None,
+) -> tuple[Dict[str, Any], OutputFormat]:
     """Load OpenAPI specification from string content.
 
     Args:
         content: The specification content
         format_hint: Format hint
+        json_loads: Optional JSON parser to use instead of the default (orjson when
+            installed, otherwise json). It must raise ValueError on invalid input, so
+            e.g. msgspec.json.decode needs a wrapper that converts msgspec.DecodeError.
+        yaml_load: Optional YAML parser to use instead of the default safe loader.
+            It must raise yaml.YAMLError on invalid input.
 
     Returns:
         Tuple of (specification dict, detected format)
     """
-    # Try JSON first if hint is JSON or no hint
-    if format_hint != OutputFormat.YAML:
+    if json_loads is None:
+        json_loads = load_json
+    if yaml_load is None:
+        yaml_load = _load_yaml
+
+    # Try JSON first if hint is JSON, or without a hint when the content starts like a JSON object or array;
+    # YAML input then skips a failed JSON parse
+    if format_hint == OutputFormat.JSON or (format_hint != OutputFormat.YAML and _JSON_START_RE.match(content)):
         try:
-            spec = json.loads(content)
+            spec = json_loads(content)
             return spec, OutputFormat.JSON
-        except json.JSONDecodeError:
+        except ValueError:
             if format_hint == OutputFormat.JSON:
                 raise ValueError("Invalid JSON format")
 
     # Try YAML
     try:
-        spec = yaml.safe_load(content)
+        spec = yaml_load(content)
         if spec is None:
             raise ValueError("Empty or invalid YAML content")
         return spec, OutputFormat.YAML
@@ -327,30 +561,48 @@ def apply_rules(spec: Dict[str, Any], rules: List[Rule]) -> Dict[str, Any]:
     Returns:
         Processed specification
     """
-    # Make a deep copy to avoid modifying the original
-    spec = copy.deepcopy(spec)
-
-    for rule in rules:
-        if rule.node_type == NodeType.PATH_METHOD:
-            # Process path/method rules
-            paths = spec.get("paths", {})
-            for path, path_item in list(paths.items()):
-                if not isinstance(path_item, dict):
+    # Avoid modifying the original: copy the spec and its paths shallowly up front,
+    # and each path item only when an operation is first deleted from it
+    spec = dict(spec)
+    if isinstance(spec.get("paths"), dict):
+        spec["paths"] = dict(spec["paths"])
+
+    path_method_rules = [rule for rule in rules if rule.node_type == NodeType.PATH_METHOD]
+    if path_method_rules:
+        # Walk the paths once, checking every rule against each operation
+        paths = spec.get("paths", {})
+        for path, path_item in tuple(paths.items()):
+            if not isinstance(path_item, dict):
+                continue
+
+            copied = False
+            remaining = 0
+            # Check each HTTP method
+            for method, operation in tuple(path_item.items()):
+                if method not in _HTTP_METHODS:
                     continue
 
-                # Check each HTTP method
-                for method in list(path_item.keys()):
-                    if method in ["get", "post", "put", "delete", "patch", "head", "options", "trace"]:
-                        operation = path_item[method]
-                        context = RuleContext(operation, path, method)
-
-                        if rule.evaluate(context):
-                            if rule.action == Action.DELETE:
-                                del path_item[method]
-
-                # Remove empty paths
-                if not any(method in path_item for method in ["get", "post", "put", "delete", "patch", "head", "options", "trace"]):
-                    del paths[path]
+                # The context (and its resource wrapper) is only built once a rule needs the resource
+                context = None
+                for rule in path_method_rules:
+                    if rule._uses_resource:
+                        if context is None:
+                            context = RuleContext(operation, path, method)
+                        matched = rule.evaluate(context)
+                    else:
+                        matched = rule._evaluate_path_method(path, method)
+                    if matched and rule.action == Action.DELETE:
+                        if not copied:
+                            path_item = paths[path] = dict(path_item)
+                            copied = True
+                        del path_item[method]
+                        break
+                else:
+                    remaining += 1
+
+            # Remove empty paths, counted while walking the operations instead of rescanning the keys
+            if not remaining:
+                del paths[path]
 
     return spec
 
@@ -381,13 +633,13 @@ def process_openapi(input_content: str, rules: List[str], input_format: Optional
         >>> # Returns spec with unsecured operations removed
     """
     # Parse rules
-    parsed_rules = [Rule(rule) for rule in rules]
+    parsed_rules = [_compile_rule(rule) for rule in rules]
 
     # Load specification
     spec, detected_format = load_openapi_spec(input_content, input_format)
 
-    # Apply rules
-    processed_spec = apply_rules(spec, parsed_rules)
+    # Apply rules; without any, the parsed spec is only re-serialized
+    processed_spec = apply_rules(spec, parsed_rules) if parsed_rules else spec
 
     # Determine output format
     if output_format == OutputFormat.DEFAULT or output_format is None:
@@ -397,4 +649,4 @@ def process_openapi(input_content: str, rules: List[str], input_format: Optional
     if output_format == OutputFormat.JSON:
         return json.dumps(processed_spec, indent=2)
     else:  # YAML
-        return yaml.dump(processed_spec, default_flow_style=False, sort_keys=False)
+        return yaml.dump(processed_spec, Dumper=_SafeDumper, default_flow_style=False, sort_keys=False)
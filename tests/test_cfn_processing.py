@@ -9,6 +9,7 @@ import yaml
 from aws_sam_tools.cfn_processing import (
     load_yaml,
     load_yaml_file,
+    prepare_value_for_serialization,
     process_yaml_template,
 )
 
@@ -44,6 +45,17 @@ info:
         }
         assert result == expected
 
+    def test_include_json_file_with_large_integer(self, tmp_path: Path) -> None:
+        """Test including a JSON file with an integer wider than 64 bits."""
+        include_file = tmp_path / "big.json"
+        include_file.write_text('{"value": 123456789012345678901234567890}')
+
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("Def: !CFNToolsIncludeFile big.json")
+
+        result = load_yaml_file(str(main_file))
+        assert result == {"Def": {"value": 123456789012345678901234567890}}
+
     def test_include_json_file(self, tmp_path: Path) -> None:
         """Test including a JSON file."""
         # Create test JSON file to include
@@ -209,6 +221,60 @@ Properties:
         assert isinstance(tag_value, CloudFormationObject)
         assert tag_value.name == "Fn::Sub"
 
+    def test_repeated_include_returns_independent_copies(self, tmp_path: Path) -> None:
+        """Test that including the same file twice yields equal but independent values."""
+        include_file = tmp_path / "policy.json"
+        include_file.write_text('{"Statement": [{"Effect": "Allow"}]}')
+
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("""First: !CFNToolsIncludeFile policy.json
+Second: !CFNToolsIncludeFile policy.json""")
+
+        result = load_yaml_file(str(main_file))
+        assert result["First"] == result["Second"]
+        result["First"]["Statement"].append({"Effect": "Deny"})
+        result["First"]["Statement"][0]["Effect"] = "Deny"
+        assert result["Second"] == {"Statement": [{"Effect": "Allow"}]}
+
+    def test_modified_include_is_reloaded(self, tmp_path: Path) -> None:
+        """Test that changes to an included file are picked up by later loads."""
+        include_file = tmp_path / "data.yaml"
+        include_file.write_text("Value: one")
+
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("Data: !CFNToolsIncludeFile data.yaml")
+
+        assert load_yaml_file(str(main_file)) == {"Data": {"Value": "one"}}
+
+        include_file.write_text("Value: three")
+        assert load_yaml_file(str(main_file)) == {"Data": {"Value": "three"}}
+
+    def test_modified_include_replaces_cache_entry(self, tmp_path: Path) -> None:
+        """Test that a changed included file replaces its cached result instead of adding another."""
+        from aws_sam_tools.cfn_processing import _include_cache
+
+        include_file = tmp_path / "data.yaml"
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("Data: !CFNToolsIncludeFile data.yaml")
+
+        for value in ("one", "three", "seventeen"):
+            include_file.write_text(f"Value: {value}")
+            assert load_yaml_file(str(main_file)) == {"Data": {"Value": value}}
+
+        assert sum(1 for path, _ in _include_cache if path == str(include_file)) == 1
+
+    def test_include_with_cfntools_tags_is_reevaluated(self, tmp_path: Path) -> None:
+        """Test that CFNTools tags inside an included file are evaluated on every include."""
+        include_file = tmp_path / "id.yaml"
+        include_file.write_text("Id: !CFNToolsUUID")
+
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("""First: !CFNToolsIncludeFile id.yaml
+Second: !CFNToolsIncludeFile id.yaml""")
+
+        result = load_yaml_file(str(main_file))
+        assert result["First"]["Id"] != result["Second"]["Id"]
+
 
 class TestCFNToolsToString:
     """Test cases for !CFNToolsToString tag."""
@@ -248,6 +314,37 @@ class TestCFNToolsToString:
         expected_json = '{"name":"John","age":30}'
         assert result == {"MyStack": {"Def": expected_json}}
 
+    def test_dict_with_non_string_keys_to_json_string(self) -> None:
+        """Test converting dict with integer keys to JSON string."""
+        yaml_content = """MyStack:
+  Def: !CFNToolsToString [ { 80: "http", 443: "https" }, { OneLine: true } ]"""
+
+        result = load_yaml(yaml_content)
+        assert result == {"MyStack": {"Def": '{"80":"http","443":"https"}'}}
+
+    def test_deeply_nested_tags_to_string(self) -> None:
+        """Test that tags nested inside other tags are converted to intrinsic functions."""
+        yaml_content = """JSON: !CFNToolsToString [ { Name: !Sub [ "${Prefix}-name", { Prefix: !Ref Env } ] }, { OneLine: true } ]
+YAML: !CFNToolsToString [ { Name: !Sub [ "${Prefix}-name", { Prefix: !Ref Env } ] }, { ConvertTo: "YAMLString" } ]"""
+
+        result = load_yaml(yaml_content)
+        expected = {"Name": {"Fn::Sub": ["${Prefix}-name", {"Prefix": {"Ref": "Env"}}]}}
+        assert json.loads(result["JSON"]) == expected
+        assert yaml.safe_load(result["YAML"]) == expected
+
+    def test_aliased_value_to_yaml_string(self) -> None:
+        """Test that values shared through YAML aliases are written out in full, without anchors."""
+        yaml_content = """Def: !CFNToolsToString
+  - first: &common { Name: !Ref Env }
+    second: *common
+  - ConvertTo: YAMLString"""
+
+        result = load_yaml(yaml_content)
+        assert "&" not in result["Def"]
+        assert "*" not in result["Def"]
+        expected = {"Name": {"Ref": "Env"}}
+        assert yaml.safe_load(result["Def"]) == {"first": expected, "second": expected}
+
     def test_string_with_newlines_one_line(self) -> None:
         """Test converting string with newlines to single line."""
         yaml_content = """MyStack:
@@ -356,6 +453,38 @@ class TestCFNToolsToString:
         # Should preserve Unicode without escaping
         assert '"message": "Hello 世界! 🌍"' in result["MyStack"]["Def"]
 
+    def test_non_finite_floats_to_json_string(self) -> None:
+        """Test that infinite and NaN floats are written as the json module writes them."""
+        yaml_content = """MyStack:
+  Def: !CFNToolsToString [ { a: .inf, b: -.inf, c: .nan, d: 1.5e-07 }, { OneLine: true } ]"""
+
+        result = load_yaml(yaml_content)
+        assert result == {"MyStack": {"Def": '{"a":Infinity,"b":-Infinity,"c":NaN,"d":1.5e-07}'}}
+
+    def test_date_to_json_string_fails(self) -> None:
+        """Test that dates cannot be converted to a JSON string."""
+        yaml_content = """MyStack:
+  Def: !CFNToolsToString [ { released: 2024-01-01 }, { OneLine: true } ]"""
+
+        with pytest.raises(TypeError):
+            load_yaml(yaml_content)
+
+
+class TestPrepareValueForSerialization:
+    """Test cases for prepare_value_for_serialization."""
+
+    def test_converts_nested_tags(self) -> None:
+        """Test that tags nested in dicts and lists are converted."""
+        value = load_yaml("""Items:
+  - Name: !Ref MyBucket
+  - Plain: value""")
+        result = prepare_value_for_serialization(value)
+        assert result == {"Items": [{"Name": {"Ref": "MyBucket"}}, {"Plain": "value"}]}
+
+        from aws_sam_tools.cfn_tags import CloudFormationObject
+
+        assert isinstance(value["Items"][0]["Name"], CloudFormationObject)
+
 
 class TestCFNToolsUUID:
     """Test cases for !CFNToolsUUID tag."""
@@ -1687,8 +1816,8 @@ Parameters:
         # Verify CloudFormation tags are preserved in output
         # Accept both quoted and unquoted forms
         assert "!Ref BucketNameParameter" in result or "!Ref 'BucketNameParameter'" in result
-        assert "!Sub '${Environment}-bucket'" in result or '!Sub "${Environment}-bucket"' in result
-        assert "!Sub '${AWS::StackName}-function'" in result or '!Sub "${AWS::StackName}-function"' in result
+        assert "!Sub '${Environment}-bucket'" in result or '!Sub "${Environment}-bucket"' in result or "!Sub ${Environment}-bucket" in result
+        assert "!Sub '${AWS::StackName}-function'" in result or '!Sub "${AWS::StackName}-function"' in result or "!Sub ${AWS::StackName}-function" in result
         assert "!GetAtt 'MyRole.Arn'" in result or "!GetAtt MyRole.Arn" in result
         assert "!Base64" in result
 
@@ -1902,3 +2031,26 @@ class TestIntegration:
         # Check new tag worked
         assert isinstance(result["Resources"]["Bucket"]["Properties"]["Policy"], str)
         assert "Statement" in result["Resources"]["Bucket"]["Properties"]["Policy"]
+
+    def test_large_template_file(self, tmp_path: Path) -> None:
+        """Test loading a template the parser has to read from the file in several chunks."""
+        (tmp_path / "tags.json").write_text('[{"Key": "Team", "Value": "core"}]')
+        resources = "".join(
+            f"""  Bucket{i}:
+    Type: AWS::S3::Bucket
+    Properties:
+      BucketName: !Sub "${{AWS::StackName}}-bucket-{i}"
+      Tags: !CFNToolsIncludeFile tags.json
+"""
+            for i in range(1000)
+        )
+        main_file = tmp_path / "template.yaml"
+        main_file.write_text("Resources:\n" + resources)
+        assert main_file.stat().st_size > 64 * 1024
+
+        result = load_yaml_file(str(main_file), replace_tags=True)
+        assert len(result["Resources"]) == 1000
+        assert result["Resources"]["Bucket999"]["Properties"] == {
+            "BucketName": {"Fn::Sub": "${AWS::StackName}-bucket-999"},
+            "Tags": [{"Key": "Team", "Value": "core"}],
+        }
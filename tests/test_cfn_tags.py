@@ -192,6 +192,50 @@ Resources:
             assert isinstance(loaded, CloudFormationObject)
             assert loaded.name == expected_name
 
+    def test_inject_is_idempotent(self):
+        """Test that repeated inject() calls reuse the tag classes and register new loaders."""
+        import yaml
+
+        from aws_sam_tools import cfn_tags
+
+        ref_class = type(load_yaml("!Ref MyBucket"))
+
+        class ExtraLoader(yaml.SafeLoader):
+            pass
+
+        cfn_tags.inject(ExtraLoader)
+
+        loaded = yaml.load("!Ref MyBucket", Loader=ExtraLoader)
+        assert type(loaded) is ref_class
+        assert type(load_yaml("!Ref MyBucket")) is ref_class
+
+    def test_uses_libyaml_when_available(self):
+        """Test that the loader and dumper are built on the libyaml bindings when PyYAML has them."""
+        import pytest
+        import yaml
+
+        from aws_sam_tools.cfn_tags import CloudFormationDumper, CloudFormationLoader
+
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML was built without libyaml")
+
+        assert issubclass(CloudFormationLoader, yaml.CSafeLoader)
+        assert issubclass(CloudFormationDumper, yaml.CSafeDumper)
+
+    def test_tag_as_mapping_key_is_rejected(self):
+        """Test that a tag used as a mapping key fails to load with its position."""
+        import pytest
+        from yaml.constructor import ConstructorError
+
+        with pytest.raises(ConstructorError, match="unhashable key"):
+            load_yaml("!Ref Env: value")
+
+    def test_tag_objects_use_slots(self):
+        """Test that loaded tag objects carry no per-instance __dict__."""
+        result = load_yaml("Value: !Ref MyBucket")
+        assert not hasattr(result["Value"], "__dict__")
+        assert result["Value"].data == "MyBucket"
+
 
 class TestCloudFormationDumper:
     """Test CloudFormationDumper functionality."""
@@ -522,3 +566,12 @@ Outputs:
         repr_str = repr(obj)
         assert "Sub(" in repr_str
         assert "${AWS::StackName}-bucket" in repr_str
+
+    def test_submodules_available_from_package(self):
+        """Test that submodules are reachable as attributes of a freshly imported package."""
+        import subprocess
+        import sys
+
+        code = "import aws_sam_tools; print(aws_sam_tools.cfn_tags.__name__, aws_sam_tools.openapi.__name__)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.split() == ["aws_sam_tools.cfn_tags", "aws_sam_tools.openapi"]
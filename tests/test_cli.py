@@ -172,6 +172,44 @@ Resources:
         assert result.exit_code == 1
         assert "Error: Failed to parse YAML" in result.output
 
+    def test_template_process_command_invalid_yaml_names_file(self, tmp_path: Path) -> None:
+        """Test that YAML parse errors point at the template file."""
+        template_file = tmp_path / "invalid.yaml"
+        template_file.write_text("Resources:\n  Bucket: [\n    a: b: c\n")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["template", "process", "--template", str(template_file)])
+
+        assert result.exit_code == 1
+        assert "Error: Failed to parse YAML" in result.output
+        assert f'in "{template_file}", line 3' in result.output
+
+    def test_template_process_command_error_keeps_existing_output(self, tmp_path: Path) -> None:
+        """Test that a failed run does not overwrite an existing output file."""
+        template_file = tmp_path / "invalid.yaml"
+        template_file.write_text("Resources: [")
+        output_file = tmp_path / "output.yaml"
+        output_file.write_text("previous: output\n")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["template", "process", "--template", str(template_file), "--output", str(output_file)])
+
+        assert result.exit_code == 1
+        assert output_file.read_text() == "previous: output\n"
+
+    def test_template_process_command_output_dir_missing(self, tmp_path: Path) -> None:
+        """Test that an output file that cannot be created is named in the error."""
+        template_file = tmp_path / "template.yaml"
+        template_file.write_text("test: value")
+        output_file = tmp_path / "missing" / "output.yaml"
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["template", "process", "--template", str(template_file), "--output", str(output_file)])
+
+        assert result.exit_code == 1
+        assert "No such file or directory" in result.output
+        assert str(output_file) in result.output
+
     def test_template_process_command_cfntools_error(self, tmp_path: Path) -> None:
         """Test template process command when CFNTools tag has error."""
         template_file = tmp_path / "template.yaml"
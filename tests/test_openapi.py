@@ -52,6 +52,15 @@ class TestSafeNavigationDict:
         assert nav.a.b.c == None  # noqa: E711
         assert nav.x.y.z == None  # noqa: E711
 
+    def test_missing_lookups_share_instance(self):
+        """Test that missing keys and indices return one shared, falsy wrapper."""
+        nav = SafeNavigationDict({"items": []})
+
+        assert nav.x is nav.items[0]
+        assert nav.x is nav.x.y["z"]
+        assert not nav.x
+        assert nav.x.value is None
+
     def test_comparisons(self):
         """Test comparison operations."""
         data = {"auth": "oauth2", "empty": None}
@@ -129,6 +138,68 @@ class TestRule:
         # Should return False (evaluation fails safely)
         assert rule.evaluate(context) is False
 
+    def test_is_none_checks(self):
+        """Test is None / is not None checks on resources and context values."""
+        missing = Rule("path/method : delete : resource.security is None")
+        assert missing.evaluate(RuleContext({"summary": "Test"})) is True
+        assert missing.evaluate(RuleContext({"security": [{"api_key": []}]})) is False
+
+        has_path = Rule("path/method : delete : path is not None")
+        assert has_path.evaluate(RuleContext({}, "/users", "get")) is True
+        assert has_path.evaluate(RuleContext({})) is False
+
+    def test_is_none_inside_string_literal(self):
+        """Test that 'is None' inside a string literal is left untouched."""
+        rule = Rule("path/method : delete : resource.summary == 'value is None'")
+
+        assert rule.evaluate(RuleContext({"summary": "value is None"})) is True
+        assert rule.evaluate(RuleContext({"summary": "other"})) is False
+
+    def test_nested_access(self):
+        """Test attribute and index chains in rule expressions."""
+        resource = {"responses": {"200": {"description": "OK"}}, "tags": ["internal", "beta"], "x-meta": {"owner": None}}
+        context = RuleContext(resource, "/users", "get")
+
+        assert Rule("path/method : delete : resource.responses['200'].description == 'OK'").evaluate(context) is True
+        assert Rule("path/method : delete : resource.tags[1] == 'beta'").evaluate(context) is True
+        assert Rule("path/method : delete : resource['x-meta'].owner is None").evaluate(context) is True
+        assert Rule("path/method : delete : resource.responses.value == {'200': {'description': 'OK'}}").evaluate(context) is True
+        assert Rule("path/method : delete : resource.responses['404'].description is not None").evaluate(context) is False
+
+    def test_generator_expression_uses_context(self):
+        """Test that generator expressions can refer to the context values."""
+        rule = Rule("path/method : delete : any(method == m for m in ['put', 'patch'])")
+
+        assert rule.evaluate(RuleContext({}, "/users", "patch")) is True
+        assert rule.evaluate(RuleContext({}, "/users", "get")) is False
+
+    def test_constant_expressions(self):
+        """Test rules whose expressions do not depend on the operation."""
+        assert Rule("path/method : delete : True").evaluate(RuleContext({})) is True
+        assert Rule("path/method : delete : len([1, 2]) > 3").evaluate(RuleContext({"security": []})) is False
+        assert Rule("path/method : delete : 1 / 0").evaluate(RuleContext({})) is False
+
+    def test_invalid_expression_never_matches(self):
+        """Test that a filter expression with a syntax error never matches."""
+        rule = Rule("path/method : delete : resource.security ==")
+
+        assert rule.evaluate(RuleContext({"security": []})) is False
+        assert rule.evaluate(RuleContext({})) is False
+
+    def test_expression_with_null_character_never_matches(self):
+        """Test that a filter expression containing a null character never matches."""
+        rule = Rule("path/method : delete : resource.a\x00")
+
+        assert rule.evaluate(RuleContext({"a": True})) is False
+
+    def test_very_long_expression_is_evaluated(self):
+        """Test that long expressions are rewritten and evaluated like short ones."""
+        assert Rule("path/method : delete : " + "+".join(["1"] * 5000)).evaluate(RuleContext({})) is True
+
+        rule = Rule("path/method : delete : " + "not " * 2000 + "resource.a['b'].c is None")
+        assert rule.evaluate(RuleContext({"a": {"b": {}}})) is True
+        assert rule.evaluate(RuleContext({"a": {"b": {"c": 1}}})) is False
+
 
 class TestFormatDetection:
     """Test format detection functionality."""
@@ -167,6 +238,14 @@ class TestLoadOpenAPISpec:
         assert spec["info"]["title"] == "Test"
         assert format == OutputFormat.JSON
 
+    def test_load_json_with_large_integer(self):
+        """Test that integers wider than 64 bits keep their exact value."""
+        content = '{"openapi": "3.0.0", "x-id": 123456789012345678901234567890}'
+        spec, format = load_openapi_spec(content)
+
+        assert spec["x-id"] == 123456789012345678901234567890
+        assert format == OutputFormat.JSON
+
     def test_load_yaml(self):
         """Test loading YAML spec."""
         content = """openapi: 3.0.0
@@ -180,6 +259,38 @@ info:
         assert spec["info"]["title"] == "Test"
         assert format == OutputFormat.YAML
 
+    def test_load_detects_format_from_content(self):
+        """Test format detection from the leading characters of the content."""
+        spec, format = load_openapi_spec('\n  {"openapi": "3.0.0"}')
+        assert spec == {"openapi": "3.0.0"}
+        assert format == OutputFormat.JSON
+
+        # YAML flow mappings also start with a brace
+        spec, format = load_openapi_spec("{openapi: 3.0.0}")
+        assert spec == {"openapi": "3.0.0"}
+        assert format == OutputFormat.YAML
+
+    def test_load_with_custom_parsers(self):
+        """Test that callers can supply their own JSON and YAML parsers."""
+        calls = []
+
+        def json_loads(content):
+            calls.append("json")
+            return json.loads(content)
+
+        def yaml_load(content):
+            calls.append("yaml")
+            return yaml.safe_load(content)
+
+        spec, format = load_openapi_spec('{"openapi": "3.0.0"}', json_loads=json_loads, yaml_load=yaml_load)
+        assert spec == {"openapi": "3.0.0"}
+        assert format == OutputFormat.JSON
+
+        spec, format = load_openapi_spec("openapi: 3.0.0", json_loads=json_loads, yaml_load=yaml_load)
+        assert spec == {"openapi": "3.0.0"}
+        assert format == OutputFormat.YAML
+        assert calls == ["json", "yaml"]
+
     def test_load_with_format_hint(self):
         """Test loading with format hint."""
         yaml_content = "openapi: 3.0.0"
@@ -232,6 +343,40 @@ class TestApplyRules:
         # Path should be removed entirely
         assert "/users" not in result["paths"]
 
+    def test_path_and_method_rules(self):
+        """Test rules that only look at the path and method."""
+        spec = {"paths": {"/internal/health": {"get": {}, "post": {}}, "/users": {"get": {}, "delete": {}}}}
+
+        rules = [
+            Rule("path/method : delete : path.startswith('/internal')"),
+            Rule("path/method : delete : method == 'delete'"),
+        ]
+        result = apply_rules(spec, rules)
+
+        assert result["paths"] == {"/users": {"get": {}}}
+
+    def test_paths_without_operations_removed(self):
+        """Test that paths left without any operation are removed, whether or not a rule deleted one."""
+        spec = {"paths": {"/users": {"get": {"summary": "List"}, "parameters": []}, "/shared": {"parameters": []}}}
+
+        rule = Rule("path/method : delete : resource.summary == 'List'")
+        result = apply_rules(spec, [rule])
+
+        assert result["paths"] == {}
+
+    def test_overlapping_rules(self):
+        """Test that an operation matched by several rules is deleted once."""
+        spec = {"paths": {"/users": {"get": {"security": [{"api_key": []}]}, "post": {"summary": "Create"}}}}
+
+        rules = [
+            Rule("path/method : delete : resource.security is not None"),
+            Rule("path/method : delete : method == 'get'"),
+            Rule("path/method : delete : resource.summary == 'Create'"),
+        ]
+        result = apply_rules(spec, rules)
+
+        assert "/users" not in result["paths"]
+
     def test_original_spec_unchanged(self):
         """Test that original spec is not modified."""
         spec = {"paths": {"/users": {"get": {"security": [{"api_key": []}]}}}}
@@ -244,6 +389,16 @@ class TestApplyRules:
         # Result should not
         assert "/users" not in result["paths"]
 
+    def test_original_path_item_unchanged(self):
+        """Test that deleting one of several operations leaves the original path item intact."""
+        spec = {"paths": {"/users": {"get": {"security": [{"api_key": []}]}, "post": {"summary": "Create"}}}}
+
+        rule = Rule("path/method : delete : resource.security is not None")
+        result = apply_rules(spec, [rule])
+
+        assert list(spec["paths"]["/users"]) == ["get", "post"]
+        assert list(result["paths"]["/users"]) == ["post"]
+
 
 class TestProcessOpenAPI:
     """Test the main process_openapi function."""
@@ -293,6 +448,51 @@ paths:
 
         assert "/users" not in result_spec["paths"]
 
+    def test_process_yaml_to_json_output_format(self):
+        """Test that JSON output matches json.dumps for non-string keys and non-ASCII text."""
+        input_yaml = """openapi: 3.0.0
+info:
+  title: Café API
+paths:
+  /users:
+    get:
+      responses:
+        200:
+          description: OK
+"""
+        result = process_openapi(input_yaml, [], output_format=OutputFormat.JSON)
+
+        assert result == json.dumps(yaml.safe_load(input_yaml), indent=2)
+        assert '"200": {' in result
+        assert "Caf\\u00e9 API" in result
+
+    def test_process_yaml_to_json_non_finite_and_small_floats(self):
+        """Test that infinite, NaN and exponent-formatted floats are written as json.dumps writes them."""
+        input_yaml = """openapi: 3.0.0
+x-max: .inf
+x-min: -.inf
+x-nan: .nan
+x-small: 1.5e-07
+x-large: 1.0e+16
+paths: {}
+"""
+        result = process_openapi(input_yaml, [], output_format=OutputFormat.JSON)
+
+        assert result == json.dumps(yaml.safe_load(input_yaml), indent=2)
+        assert '"x-max": Infinity' in result
+        assert '"x-min": -Infinity' in result
+        assert '"x-nan": NaN' in result
+        assert '"x-small": 1.5e-07' in result
+
+    def test_process_yaml_to_json_rejects_dates(self):
+        """Test that YAML dates fail JSON output whether or not orjson is installed."""
+        input_yaml = """openapi: 3.0.0
+x-released: 2024-01-01
+paths: {}
+"""
+        with pytest.raises(TypeError):
+            process_openapi(input_yaml, [], output_format=OutputFormat.JSON)
+
     def test_process_multiple_rules(self):
         """Test processing with multiple rules."""
         input_yaml = """openapi: 3.0.0